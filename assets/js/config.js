@@ -57,29 +57,38 @@ async function handleAddQuiz() {
     // Show processing message
     showMessage('🔄 Creating quiz automatically... Please wait.', 'info');
 
-    try {
-        // Read file content
-        const file = fileInput.files[0];
-        const fileContent = await readFileAsText(file);
+    const file = fileInput.files[0];
 
-        // Try the API first
-        const quizData = {
+    try {
+        // Stream the raw file to the API; metadata travels in the query string
+        // so the server can parse questions as the upload arrives
+        const params = new URLSearchParams({
             quiz_id: quizId,
             quiz_name: quizName,
-            description: quizDescription,
-            file_content: fileContent
-        };
-
-        const response = await fetch('/api/create-quiz', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(quizData)
+            description: quizDescription
         });
 
+        const progressPoll = setInterval(() => pollUploadProgress(quizId), 1000);
+        let response;
+        try {
+            response = await fetch(`/api/create-quiz?${params}`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'text/plain; charset=utf-8',
+                },
+                body: file
+            });
+        } finally {
+            clearInterval(progressPoll);
+        }
+
         const result = await response.json();
 
+        if (isServerBusy(response)) {
+            showBusyMessage(response, result);
+            return;
+        }
+
         if (result.success) {
             const questionCount = result.questions_processed || 'Unknown';
             showMessage(`✅ ${result.message}<br>📊 Questions processed: ${questionCount}`, 'success');
@@ -93,6 +102,8 @@ async function handleAddQuiz() {
 
     // If API fails, create download and run command automatically
     try {
+        const fileContent = await readFileAsText(file);
+
         // Create file download
         const blob = new Blob([fileContent], { type: 'text/plain' });
         const url = window.URL.createObjectURL(blob);
@@ -215,6 +226,33 @@ function copyCommand() {
     });
 }
 
+// The server refuses admin operations when overloaded (503), rate limited (429)
+// or sent too much data (413); these need a retry, not the manual fallback
+function isServerBusy(response) {
+    return [413, 429, 503].includes(response.status);
+}
+
+function showBusyMessage(response, result) {
+    const retryAfter = response.headers.get('Retry-After');
+    const retryText = retryAfter ? ` Please try again in ${retryAfter} seconds.` : '';
+    showMessage(`⏳ ${result.error}.${retryText}`, 'warning');
+}
+
+// Show how far a streamed upload has got while the create request is pending
+async function pollUploadProgress(quizId) {
+    try {
+        const response = await fetch(`/api/upload-progress?quiz_id=${encodeURIComponent(quizId)}`);
+        if (!response.ok) {
+            return;
+        }
+        const progress = await response.json();
+        const kb = Math.round(progress.bytes_received / 1024);
+        showMessage(`🔄 Creating quiz... ${progress.questions_written} questions processed (${kb} KB received)`, 'info');
+    } catch (error) {
+        // Progress is best-effort only
+    }
+}
+
 // Helper function to read file as text
 function readFileAsText(file) {
     return new Promise((resolve, reject) => {
@@ -225,17 +263,34 @@ function readFileAsText(file) {
     });
 }
 
+// Fetch /api/bootstrap (config plus per-set stats); null when the API isn't available
+async function fetchBootstrap(query = '') {
+    try {
+        const response = await fetch(`/api/bootstrap${query}`);
+        return response.ok ? await response.json() : null;
+    } catch (error) {
+        return null;
+    }
+}
+
 async function loadQuizList() {
     try {
-        const response = await fetch('assets/data/quiz-config.json');
-        const config = await response.json();
+        const bootstrapData = await fetchBootstrap();
+        let config;
+        if (bootstrapData) {
+            config = bootstrapData.config;
+        } else {
+            const response = await fetch('assets/data/quiz-config.json');
+            config = await response.json();
+        }
+        const setStats = bootstrapData ? bootstrapData.sets : {};
         
         if (config && config['quiz-sets']) {
             const quizzes = Object.entries(config['quiz-sets']).map(([filename, quiz]) => ({
                 filename,
                 name: quiz.name || 'Unknown',
                 description: quiz.description || 'No description',
-                question_count: quiz.question_count || 0,
+                question_count: setStats[filename]?.question_count ?? quiz.question_count ?? 0,
                 difficulty: quiz.difficulty || 'Mixed',
                 default: quiz.default || false,
                 recommended: quiz.recommended || false,
@@ -368,6 +423,11 @@ async function confirmDeleteQuiz() {
 
         const result = await response.json();
 
+        if (isServerBusy(response)) {
+            showBusyMessage(response, result);
+            return;
+        }
+
         if (result.success) {
                 showMessage(`✅ ${result.message}`, 'success');
                 // Refresh the quiz list to show changes
@@ -425,20 +485,43 @@ function copyDeleteCommand() {
     });
 }
 
+// Statistics and the first question of a quiz set. The server precomputes the
+// stats, so only one question is transferred; otherwise the whole set is fetched.
+async function loadQuizStats(filename) {
+    const bootstrapData = await fetchBootstrap(`?set=${encodeURIComponent(filename)}&limit=1`);
+    const stats = bootstrapData?.sets[filename];
+    if (stats?.available && bootstrapData.questions?.items.length) {
+        return {
+            totalQuestions: stats.question_count,
+            multipleChoiceCount: stats.multiple_count,
+            avgOptionsPerQuestion: stats.average_options,
+            sampleQuestion: bootstrapData.questions.items[0]
+        };
+    }
+    
+    const response = await fetch(`assets/data/${filename}`);
+    const quizData = await response.json();
+    if (!quizData || !Array.isArray(quizData)) {
+        return null;
+    }
+    return {
+        totalQuestions: quizData.length,
+        multipleChoiceCount: quizData.filter(q => q.multiple === true).length,
+        avgOptionsPerQuestion: quizData.reduce((sum, q) => sum + (q.options?.length || 0), 0) / quizData.length,
+        sampleQuestion: quizData[0]
+    };
+}
+
 async function viewQuizDetails(filename) {
     try {
-        const response = await fetch(`assets/data/${filename}`);
-        const quizData = await response.json();
+        const stats = await loadQuizStats(filename);
         
-        if (quizData && Array.isArray(quizData)) {
-            // Calculate some statistics
-            const totalQuestions = quizData.length;
-            const multipleChoiceCount = quizData.filter(q => q.multiple === true).length;
+        if (stats) {
+            // Unpack the statistics
+            const { totalQuestions, multipleChoiceCount, avgOptionsPerQuestion, sampleQuestion } = stats;
             const singleChoiceCount = totalQuestions - multipleChoiceCount;
-            const avgOptionsPerQuestion = quizData.reduce((sum, q) => sum + (q.options?.length || 0), 0) / totalQuestions;
             
             // Get a sample question
-            const sampleQuestion = quizData[0];
             const sampleAnswers = sampleQuestion.correctAnswers?.map(idx => 
                 String.fromCharCode(65 + idx)).join(', ') || 'Unknown';
             
@@ -17,10 +17,41 @@ let questionCount = 50; // Default question count
 let timeLimit = 100; // Default time limit in minutes
 let availableQuizSets = {}; // Store available quiz sets
 let selectedQuizSet = null; // Will be set to the default from config
+let practiceMode = 'random'; // 'adaptive' picks questions with the server's spaced-repetition scheduler
+
+// Load config, set list and the default set in one request (final_server.py only)
+async function loadBootstrap() {
+  try {
+    const response = await fetch('/api/bootstrap?limit=all');
+    if (!response.ok) {
+      return false;
+    }
+    const data = await response.json();
+    availableQuizSets = data.config['quiz-sets'] || {};
+    selectedQuizSet = data.default_set;
+    questions = data.questions ? data.questions.items : [];
+    
+    // Adaptive practice needs the server, which we now know is there
+    const practiceModeRow = document.getElementById('practiceModeRow');
+    if (practiceModeRow) practiceModeRow.style.display = 'flex';
+    return true;
+  } catch (error) {
+    // Static hosting has no API - fall back to fetching the files
+    return false;
+  }
+}
 
 // Load quiz configuration and available sets
 async function loadAvailableQuizSets() {
   try {
+    if (await loadBootstrap()) {
+      populateQuestionSetDropdown();
+      updateQuestionCountOptions();
+      updateSetDescription();
+      console.log(`Loaded ${questions.length} questions from ${selectedQuizSet}`);
+      return;
+    }
+    
     // Try to load quiz configuration file
     const configResponse = await fetch('assets/data/quiz-config.json');
     if (configResponse.ok) {
@@ -246,6 +277,8 @@ function continueStartQuiz(questionCountSelect, timeLimitSelect) {
   
   questionCount = questionCountSelect.value === 'all' ? questions.length : parseInt(questionCountSelect.value);
   timeLimit = timeLimitSelect.value === 'unlimited' ? 0 : parseInt(timeLimitSelect.value);
+  const practiceModeSelect = document.getElementById('practiceMode');
+  practiceMode = practiceModeSelect ? practiceModeSelect.value : 'random';
   
   // Validate we have enough questions
   if (questionCount > questions.length) {
@@ -274,7 +307,48 @@ function continueStartQuiz(questionCountSelect, timeLimitSelect) {
   startQuiz();
 }
 
-function startQuiz() {
+// Anonymous id so the server can track this browser's practice history
+function getLearnerId() {
+  let learnerId = localStorage.getItem('quizLearnerId');
+  if (!learnerId) {
+    learnerId = window.crypto?.randomUUID ? crypto.randomUUID()
+      : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    localStorage.setItem('quizLearnerId', learnerId);
+  }
+  return learnerId;
+}
+
+// Ask the scheduler for the next questions: due reviews first, then unseen ones
+async function loadPracticeBatch() {
+  try {
+    const params = new URLSearchParams({ learner: getLearnerId(), set: selectedQuizSet, count: questionCount });
+    const response = await fetch(`/api/practice/next?${params}`);
+    if (!response.ok) {
+      return null;
+    }
+    const data = await response.json();
+    return data.questions;
+  } catch (error) {
+    console.error('Error loading practice batch:', error);
+    return null;
+  }
+}
+
+// Report an answer so the scheduler can decide when to show the question again
+function recordPracticeAttempt(question, selected) {
+  fetch('/api/practice/answer', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({
+      learner: getLearnerId(),
+      set: selectedQuizSet,
+      question_id: question.id,
+      selected: selected
+    })
+  }).catch(error => console.error('Error recording practice attempt:', error));
+}
+
+async function startQuiz() {
   // Validate that questions is an array
   if (!Array.isArray(questions) || questions.length === 0) {
     console.error('Questions not loaded properly. questions:', questions);
@@ -282,8 +356,11 @@ function startQuiz() {
     return;
   }
   
-  // Randomly select the specified number of questions
-  selectedQuestions = questions.sort(() => Math.random() - 0.5).slice(0, questionCount);
+  selectedQuestions = practiceMode === 'adaptive' ? await loadPracticeBatch() : null;
+  if (!selectedQuestions || selectedQuestions.length === 0) {
+    // Randomly select the specified number of questions
+    selectedQuestions = questions.sort(() => Math.random() - 0.5).slice(0, questionCount);
+  }
   current = 0;
   answers = [];
   score = 0;
@@ -444,6 +521,9 @@ function submitAnswer() {
   }
   
   answers[current] = selected;
+  if (practiceMode === 'adaptive') {
+    recordPracticeAttempt(q, selected);
+  }
   current++;
   if (current < selectedQuestions.length) {
     showQuestion();
@@ -4,19 +4,520 @@ Final Working Server - Handles all encoding issues
 """
 
 import os
+import re
+import gzip
+import hashlib
 import sys
 import json
+import math
 import subprocess
+import threading
+import time
 import urllib.parse
+from contextlib import contextmanager
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import mimetypes
 
+from quiz_automation import QuizAutomation, QuestionStreamParser
+from practice_scheduler import PracticeScheduler
+
+# Size of each read when streaming a request body into the question parser
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Admin limits, overridable through environment variables
+MAX_JSON_BODY_BYTES = int(os.environ.get('QUIZ_MAX_JSON_BODY_BYTES', 10 * 1024 * 1024))
+MAX_UPLOAD_BYTES = int(os.environ.get('QUIZ_MAX_UPLOAD_BYTES', 50 * 1024 * 1024))
+ADMIN_CONCURRENCY = int(os.environ.get('QUIZ_ADMIN_CONCURRENCY', 1))
+ADMIN_QUEUE_SIZE = int(os.environ.get('QUIZ_ADMIN_QUEUE_SIZE', 4))
+ADMIN_QUEUE_TIMEOUT = float(os.environ.get('QUIZ_ADMIN_QUEUE_TIMEOUT', 30))
+ADMIN_RATE_PER_MINUTE = float(os.environ.get('QUIZ_ADMIN_RATE_PER_MINUTE', 10))
+ADMIN_RATE_BURST = int(os.environ.get('QUIZ_ADMIN_RATE_BURST', 5))
+
+# POST endpoints that convert, append or delete quiz sets
+ADMIN_ROUTES = ('/api/create-quiz', '/api/append-questions', '/api/delete-quiz')
+
+# Seconds between polls of assets/data/ for changes made outside the server
+WATCH_INTERVAL = float(os.environ.get('QUIZ_WATCH_INTERVAL', 2))
+
+# Adaptive practice: attempt log location and the largest batch one request may ask for
+PRACTICE_LOG = os.environ.get('QUIZ_PRACTICE_LOG', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'progress', 'practice_attempts.log'))
+MAX_PRACTICE_BATCH = 200
+LEARNER_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+# Progress of in-flight streamed uploads, keyed by quiz_id (see /api/upload-progress)
+UPLOAD_PROGRESS = {}
+UPLOAD_PROGRESS_LOCK = threading.Lock()
+
+# Serializes read-modify-write cycles on quiz-config.json across request threads
+CONFIG_LOCK = threading.Lock()
+
+# Serializes appends and compactions of JSONL quiz sets (taken after CONFIG_LOCK when both are held)
+JSONL_LOCK = threading.Lock()
+
+# A JSONL set is compacted once it has COMPACTION_MIN_APPENDS appends and at least a tenth of
+# its size again (after COMPACTION_DELAY seconds, so bursts are compacted once), or after
+# COMPACTION_IDLE seconds without appends
+COMPACTION_DELAY = 2.0
+COMPACTION_MIN_APPENDS = int(os.environ.get('QUIZ_COMPACTION_MIN_APPENDS', 100))
+COMPACTION_IDLE = float(os.environ.get('QUIZ_COMPACTION_IDLE', 600))
+
+
+class RequestRejected(Exception):
+    """Raised to answer a request with a specific status (413, 429, 503...)"""
+
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class AdmissionQueue:
+    """Bounded admission for heavy admin operations.
+
+    At most `concurrency` operations run at once and at most `queue_size`
+    more may wait for a slot. Anything beyond that is rejected straight away
+    with 503, so a burst of uploads can't pile up threads, memory and
+    subprocesses while students are taking quizzes on the same server.
+    """
+
+    def __init__(self, concurrency, queue_size, timeout):
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.concurrency = concurrency
+        self.capacity = concurrency + queue_size
+        self.timeout = timeout
+        self.admitted = 0
+        self.average_duration = 5.0
+        self.lock = threading.Lock()
+
+    def retry_after(self):
+        # Rough time until a slot frees up, from the moving average of run times
+        return max(1, math.ceil(self.average_duration * self.admitted / self.concurrency))
+
+    @contextmanager
+    def admit(self):
+        with self.lock:
+            if self.admitted >= self.capacity:
+                raise RequestRejected(503, 'Server busy with other quiz operations, please retry later',
+                                      self.retry_after())
+            self.admitted += 1
+        try:
+            if not self.slots.acquire(timeout=self.timeout):
+                raise RequestRejected(503, 'Timed out waiting for a free slot, please retry later',
+                                      self.retry_after())
+            started = time.monotonic()
+            try:
+                yield
+            finally:
+                self.slots.release()
+                with self.lock:
+                    duration = time.monotonic() - started
+                    self.average_duration = 0.8 * self.average_duration + 0.2 * duration
+        finally:
+            with self.lock:
+                self.admitted -= 1
+
+
+class RateLimiter:
+    """Per-client token bucket: `rate_per_minute` sustained, `burst` at once"""
+
+    def __init__(self, rate_per_minute, burst):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def check(self, client):
+        """Take a token for client; return 0 if allowed, else seconds until one is available"""
+        now = time.monotonic()
+        with self.lock:
+            if len(self.buckets) > 1024:
+                # Forget clients whose buckets have refilled completely
+                self.buckets = {key: (tokens, stamp) for key, (tokens, stamp) in self.buckets.items()
+                                if tokens + (now - stamp) * self.rate < self.burst}
+            tokens, stamp = self.buckets.get(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - stamp) * self.rate)
+            if tokens < 1:
+                self.buckets[client] = (tokens, now)
+                return max(1, math.ceil((1 - tokens) / self.rate))
+            self.buckets[client] = (tokens - 1, now)
+            return 0
+
+
+ADMISSION = AdmissionQueue(ADMIN_CONCURRENCY, ADMIN_QUEUE_SIZE, ADMIN_QUEUE_TIMEOUT)
+RATE_LIMITER = RateLimiter(ADMIN_RATE_PER_MINUTE, ADMIN_RATE_BURST)
+
+
+class JsonlCompactor:
+    """Background thread that compacts JSONL quiz sets once enough has been appended.
+
+    Compaction rewrites the whole set, so it waits until the appends amount to
+    a sizeable fraction of it, or until the set has been idle for a while.
+    `pending` maps each set to the time its compaction is due.
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name='jsonl-compactor', daemon=True)
+
+    def start(self):
+        # Pick up sets appended to from the CLI while the server was down
+        data_dir = QuizAutomation().data_dir
+        self.check([jsonl_file.name[:-1] for jsonl_file in data_dir.glob('quiz_*.jsonl')])
+        # ...and while it is running, as reported by the data watcher
+        QUIZ_CACHE.add_listener(self.check)
+        self.thread.start()
+
+    def check(self, names):
+        """Schedule compaction for any of the named sets that have uncompacted appends"""
+        automation = QuizAutomation()
+        for name in names:
+            jsonl_file = automation.data_dir / (name + 'l')
+            if not name.startswith('quiz_') or not jsonl_file.exists():
+                continue
+            try:
+                index = automation.read_jsonl_index(jsonl_file)
+                if index['appended_since_compaction']:
+                    self.schedule(name[len('quiz_'):-len('.json')], index)
+            except Exception as e:
+                print(f"⚠️  Could not read index for {jsonl_file.name}: {e}")
+
+    def schedule(self, output_name, index):
+        """Set when to compact a set, given its index after the latest append"""
+        now = time.monotonic()
+        appended = index['appended_since_compaction']
+        with self.condition:
+            if appended >= max(COMPACTION_MIN_APPENDS, index['count'] // 10):
+                self.pending[output_name] = min(self.pending.get(output_name, math.inf), now + COMPACTION_DELAY)
+            else:
+                # Each append pushes the idle deadline back
+                self.pending[output_name] = now + COMPACTION_IDLE
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while True:
+                    now = time.monotonic()
+                    batch = [name for name, due in self.pending.items() if due <= now]
+                    if batch:
+                        break
+                    self.condition.wait(min(self.pending.values()) - now if self.pending else None)
+                for output_name in batch:
+                    del self.pending[output_name]
+            for output_name in batch:
+                try:
+                    with CONFIG_LOCK, JSONL_LOCK:
+                        automation = QuizAutomation()
+                        if not automation.jsonl_paths(output_name)[0].exists():
+                            continue  # re-created as plain JSON or deleted since the append
+                        automation.compact_jsonl(output_name)
+                    QUIZ_CACHE.refresh()
+                except Exception as e:
+                    print(f"⚠️  Compaction of {output_name} failed, will retry on next append: {e}")
+
+
+COMPACTOR = JsonlCompactor()
+
+
+class CacheEntry:
+    """A file from assets/data/ held as ready-to-send bytes plus its parsed data"""
+
+    def __init__(self, body, data, signature):
+        self.body = body
+        self.data = data
+        self.signature = signature
+        self.content_hash = hashlib.sha256(body).hexdigest()[:16]
+        self.etag = f'"{self.content_hash}"'
+        self.gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+
+
+class QuizDataCache:
+    """In-memory copy of the quiz sets and quiz-config.json in assets/data/.
+
+    A background thread stats the directory every WATCH_INTERVAL seconds and
+    reloads only the files whose size or mtime changed, so edits from the CLI
+    or files dropped in by hand show up without a restart. Each refresh builds
+    a new dict and swaps it in with a single assignment, so a request always
+    sees one consistent snapshot. Listeners are told which names changed so
+    derived caches can drop just those entries. A file that fails to load is
+    remembered by signature and not retried until its size or mtime changes.
+    """
+
+    def __init__(self, data_dir, interval):
+        self.data_dir = Path(data_dir)
+        self.interval = interval
+        self.entries = {}
+        self.failed = {}
+        self.listeners = []
+        self.refresh_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.watch, name='data-watcher', daemon=True)
+
+    def get(self, name):
+        return self.entries.get(name)
+
+    def snapshot(self):
+        return self.entries
+
+    def is_known_bad(self, name):
+        """True if `name` failed to load and its file hasn't changed since"""
+        signature = self.failed.get(name)
+        if signature is None:
+            return False
+        try:
+            stat = QuizAutomation().quiz_source_file(self.data_dir / name).stat()
+        except OSError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) == signature
+
+    def add_listener(self, callback):
+        """Register callback(changed_names) to run after each swap"""
+        self.listeners.append(callback)
+
+    def start(self):
+        self.refresh()
+        self.thread.start()
+
+    def watch(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️  Data watcher error: {e}")
+
+    def scan(self):
+        """Map served name -> (path, signature) for the data files on disk"""
+        found = {}
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(('.json', '.jsonl')):
+                    continue
+                # JSONL sets are served under their .json name. When both files exist the
+                # .jsonl wins unless the .json is strictly newer (see quiz_source_file)
+                is_jsonl = entry.name.endswith('.jsonl')
+                name = entry.name[:-1] if is_jsonl else entry.name
+                stat = entry.stat()
+                other = found.get(name)
+                if other is not None:
+                    other_mtime = other[1][0]
+                    jsonl_wins = stat.st_mtime_ns >= other_mtime if is_jsonl else other_mtime >= stat.st_mtime_ns
+                    if jsonl_wins != is_jsonl:
+                        continue
+                found[name] = (Path(entry.path), (stat.st_mtime_ns, stat.st_size))
+        return found
+
+    def load(self, path, signature):
+        if path.suffix == '.jsonl':
+            body = b'[' + b','.join(QuizAutomation().iter_jsonl_lines(path)) + b']'
+        else:
+            body = path.read_bytes()
+        # Parsing also rejects files caught half-written; they are retried next poll
+        return CacheEntry(body, json.loads(body), signature)
+
+    def refresh(self):
+        """Reload changed files and swap in the new snapshot; returns the changed names"""
+        with self.refresh_lock:
+            current = self.entries
+            found = self.scan()
+            updated = dict(current)
+            changed = set()
+
+            for name, (path, signature) in found.items():
+                previous = current.get(name)
+                if previous and previous.signature == signature:
+                    continue
+                if self.failed.get(name) == signature:
+                    continue
+                try:
+                    updated[name] = self.load(path, signature)
+                except Exception as e:
+                    print(f"⚠️  Could not load {path.name}, keeping previous version until it changes: {e}")
+                    self.failed[name] = signature
+                    continue
+                self.failed.pop(name, None)
+                changed.add(name)
+
+            for name in set(self.failed) - set(found):
+                del self.failed[name]
+            for name in set(current) - set(found):
+                del updated[name]
+                changed.add(name)
+
+            if changed:
+                self.entries = updated
+                if current:
+                    print(f"🔄 Reloaded: {', '.join(sorted(changed))}")
+                else:
+                    print(f"📦 Cached {len(updated)} data files from {self.data_dir}")
+                for listener in self.listeners:
+                    try:
+                        listener(changed)
+                    except Exception as e:
+                        print(f"⚠️  Cache listener failed: {e}")
+            return changed
+
+
+QUIZ_CACHE = QuizDataCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'data'),
+                           WATCH_INTERVAL)
+
+
+class BootstrapCache:
+    """Precomputed /api/bootstrap responses.
+
+    Everything the quiz and config pages need on load - the config, each
+    set's question count, content hash and stats, and optionally the
+    questions of one set - in a single response. Finished responses are
+    dropped on any data change, but serialized question pages are only
+    dropped when their own set changes. A limit at or past the end of a set
+    is treated as the whole set, and both caches are cleared when full.
+    """
+
+    MAX_RESPONSES = 64
+    MAX_PAGES = 64
+
+    def __init__(self, data_cache):
+        self.data_cache = data_cache
+        self.summary = None
+        self.pages = {}
+        self.responses = {}
+        self.lock = threading.Lock()
+        data_cache.add_listener(self.invalidate)
+
+    def invalidate(self, changed):
+        with self.lock:
+            self.summary = None
+            self.responses = {}
+            self.pages = {key: page for key, page in self.pages.items() if key[0] not in changed}
+
+    def get(self, set_name=None, limit=0):
+        """Return a CacheEntry for the response; limit is a count or None for the whole set"""
+        with self.lock:
+            if self.summary is None:
+                self.summary = self.build_summary(self.data_cache.snapshot())
+            set_name = set_name or self.summary['default_set']
+            entry = self.data_cache.get(set_name)
+            if limit and entry is not None and isinstance(entry.data, list) and limit >= len(entry.data):
+                limit = None
+            key = (set_name, limit)
+            response = self.responses.get(key)
+            if response is None:
+                response = self.build_response(set_name, limit)
+                if len(self.responses) >= self.MAX_RESPONSES:
+                    self.responses = {}
+                self.responses[key] = response
+            return response
+
+    def build_summary(self, snapshot):
+        config_entry = snapshot.get('quiz-config.json')
+        if config_entry is not None:
+            config = config_entry.data
+        else:
+            # No config file: describe whatever quiz sets are on disk
+            config = {'quiz-sets': {}, 'metadata': {}}
+            for name in sorted(snapshot):
+                if name.startswith('quiz_'):
+                    title = name[len('quiz_'):-len('.json')].replace('_', ' ').title()
+                    config['quiz-sets'][name] = {'name': title, 'description': f'Practice questions for {title}',
+                                                 'difficulty': 'Mixed'}
+
+        quiz_sets = config.get('quiz-sets', {})
+        default_set = next((name for name, quiz in quiz_sets.items() if quiz.get('default') is True),
+                           next(iter(quiz_sets), None))
+
+        sets = {}
+        for name in quiz_sets:
+            entry = snapshot.get(name)
+            if entry is None or not isinstance(entry.data, list):
+                sets[name] = {'available': False}
+                continue
+            questions = entry.data
+            sets[name] = {
+                'available': True,
+                'question_count': len(questions),
+                'hash': entry.content_hash,
+                'multiple_count': sum(1 for q in questions if q.get('multiple') is True),
+                'average_options': round(sum(len(q.get('options', [])) for q in questions) / len(questions), 2)
+                if questions else 0
+            }
+
+        return {'config': config, 'default_set': default_set, 'sets': sets}
+
+    def build_response(self, set_name, limit):
+        head = json.dumps({'success': True, **self.summary}, ensure_ascii=False).encode('utf-8')
+        if not limit and limit is not None:
+            return CacheEntry(head, None, None)
+
+        entry = self.data_cache.get(set_name)
+        if entry is None or not isinstance(entry.data, list):
+            raise RequestRejected(404, f'Quiz set not found: {set_name}')
+
+        page = self.pages.get((set_name, limit))
+        if page is None:
+            # A whole set is already serialized in the data cache
+            page = entry.body if limit is None else json.dumps(entry.data[:limit], ensure_ascii=False).encode('utf-8')
+            if len(self.pages) >= self.MAX_PAGES:
+                self.pages = {}
+            self.pages[(set_name, limit)] = page
+
+        questions_head = json.dumps({
+            'set': set_name,
+            'total': len(entry.data),
+            'limit': len(entry.data) if limit is None else limit
+        }).encode('utf-8')[:-1]
+        body = head[:-1] + b', "questions": ' + questions_head + b', "items": ' + page + b'}}'
+        return CacheEntry(body, None, None)
+
+
+BOOTSTRAP_CACHE = BootstrapCache(QUIZ_CACHE)
+
+
+class PracticeIndex:
+    """Per-set question lookup for the practice endpoints, rebuilt when a set reloads"""
+
+    def __init__(self, data_cache):
+        self.data_cache = data_cache
+        self.indexes = {}
+        data_cache.add_listener(self.invalidate)
+
+    def invalidate(self, changed):
+        for name in changed:
+            self.indexes.pop(name, None)
+
+    def get(self, set_name):
+        """Return (question_ids, questions_by_id, content_hash) for a set, or None if it isn't loaded"""
+        entry = self.data_cache.get(set_name)
+        if entry is None or not isinstance(entry.data, list) or not set_name.startswith('quiz_'):
+            return None
+        index = self.indexes.get(set_name)
+        # Checking the hash catches an index built from a version that was replaced mid-build
+        if index is None or index[2] != entry.content_hash:
+            by_id = {q['id']: q for q in entry.data if isinstance(q, dict) and isinstance(q.get('id'), int)}
+            index = self.indexes[set_name] = (list(by_id), by_id, entry.content_hash)
+        return index
+
+
+PRACTICE_SCHEDULER = PracticeScheduler(PRACTICE_LOG)
+PRACTICE_INDEX = PracticeIndex(QUIZ_CACHE)
+
 class FinalWorkingHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Handle GET requests"""
         print(f"GET request: {self.path}")
         
+        if self.path.startswith('/api/upload-progress'):
+            self.handle_upload_progress()
+            return
+        if self.path.startswith('/api/bootstrap'):
+            self.handle_bootstrap()
+            return
+        if self.path.startswith('/api/practice/next'):
+            self.handle_practice_next()
+            return
+        
         # Handle root and config with query parameters
         if self.path == '/' or self.path.startswith('/?'):
             file_path = 'index.html'
@@ -28,7 +529,27 @@ class FinalWorkingHandler(BaseHTTPRequestHandler):
             file_path = clean_path.lstrip('/')
         
         try:
-            if os.path.isfile(file_path):
+            data_prefix = 'assets/data/'
+            if file_path.startswith(data_prefix) and '/' not in file_path[len(data_prefix):]:
+                name = file_path[len(data_prefix):]
+                entry = QUIZ_CACHE.get(name)
+                # Only .json names are cache keys; anything else (.jsonl, .idx, ...) never triggers a rescan
+                if entry is None and name.endswith('.json') \
+                        and (os.path.isfile(file_path) or os.path.isfile(file_path + 'l')) \
+                        and not QUIZ_CACHE.is_known_bad(name):
+                    # New since the last poll - pick it up now rather than waiting
+                    QUIZ_CACHE.refresh()
+                    entry = QUIZ_CACHE.get(name)
+                if entry is not None:
+                    self.serve_cached(entry, file_path)
+                    return
+            
+            source_path = file_path
+            if file_path.startswith(data_prefix) and file_path.endswith('.json'):
+                source_path = str(QuizAutomation().quiz_source_file(file_path))
+            if source_path.endswith('.jsonl'):
+                self.serve_jsonl_as_json(source_path)
+            elif os.path.isfile(file_path):
                 self.send_response(200)
                 
                 # Determine content type
@@ -58,16 +579,68 @@ class FinalWorkingHandler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(f'<h1>500 - Server Error</h1><p>{str(e)}</p>'.encode())
 
+    def serve_cached(self, entry, file_path):
+        """Serve a cached data file, honouring If-None-Match and gzip"""
+        if self.headers.get('If-None-Match') == entry.etag:
+            self.send_response(304)
+            self.send_header('ETag', entry.etag)
+            self.end_headers()
+            return
+
+        use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        body = entry.gzip_body if use_gzip else entry.body
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', entry.etag)
+        # Let browsers keep a copy but revalidate, so reloads show up immediately
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+        print(f"✅ Served from cache: {file_path}")
+
+    def serve_jsonl_as_json(self, jsonl_path):
+        """Stream a JSONL quiz set to the client as a JSON array (uncached fallback).
+
+        Only the indexed (fully written) part of the file is sent, so a
+        concurrent append never produces a truncated question.
+        """
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+
+        buffer = [b'[']
+        buffered = 1
+        first = True
+        for line in QuizAutomation().iter_jsonl_lines(Path(jsonl_path)):
+            if not first:
+                buffer.append(b',')
+            buffer.append(line)
+            buffered += len(line) + 1
+            first = False
+            if buffered >= UPLOAD_CHUNK_SIZE:
+                self.wfile.write(b''.join(buffer))
+                buffer, buffered = [], 0
+        buffer.append(b']')
+        self.wfile.write(b''.join(buffer))
+        print(f"✅ Served: {jsonl_path} as JSON array")
+
     def do_POST(self):
         """Handle POST requests"""
         print(f"📨 POST request: {self.path}")
         
         try:
-            if self.path == '/api/create-quiz':
-                self.handle_create_quiz()
-            elif self.path == '/api/delete-quiz':
-                self.handle_delete_quiz()
-            else:
+            # Streamed uploads carry their metadata in the query string
+            route = self.path.split('?')[0]
+            if route == '/api/practice/answer':
+                # Student traffic: never queued behind admin operations
+                self.check_body_size()
+                self.handle_practice_answer()
+                return
+            if route not in ADMIN_ROUTES:
                 print(f"❌ Unknown POST endpoint: {self.path}")
                 self.send_response(404)
                 self.send_header('Content-type', 'application/json')
@@ -75,7 +648,30 @@ class FinalWorkingHandler(BaseHTTPRequestHandler):
                 self.end_headers()
                 response = {'success': False, 'error': f'Unknown endpoint: {self.path}'}
                 self.wfile.write(json.dumps(response).encode())
+                return
+            
+            retry_after = RATE_LIMITER.check(self.client_address[0])
+            if retry_after:
+                raise RequestRejected(429, 'Too many quiz operations from this client, please slow down',
+                                      retry_after)
+            self.check_body_size()
+            
+            with ADMISSION.admit():
+                if route == '/api/create-quiz':
+                    self.handle_create_quiz()
+                elif route == '/api/delete-quiz':
+                    self.handle_delete_quiz()
+                elif route == '/api/append-questions':
+                    self.handle_append_questions()
+                # Swap in the changed sets now instead of at the next poll
+                QUIZ_CACHE.refresh()
                 
+        except RequestRejected as e:
+            print(f"⛔ POST rejected ({e.status}): {e}")
+            # The body may be unread; don't try to reuse the connection
+            self.close_connection = True
+            headers = {'Retry-After': str(e.retry_after)} if e.retry_after else None
+            self.send_json(e.status, {'success': False, 'error': str(e)}, headers)
         except Exception as e:
             print(f"❌ POST error: {e}")
             self.send_response(500)
@@ -94,9 +690,330 @@ class FinalWorkingHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         self.end_headers()
 
+    def send_json(self, status, payload, headers=None):
+        """Send a JSON response with CORS headers"""
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def is_streaming_upload(self):
+        """True for raw text/plain or chunked uploads (as opposed to the JSON envelope)"""
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        transfer_encoding = self.headers.get('Transfer-Encoding', '').lower()
+        return content_type == 'text/plain' or 'chunked' in transfer_encoding
+
+    def body_size_limit(self):
+        return MAX_UPLOAD_BYTES if self.is_streaming_upload() else MAX_JSON_BODY_BYTES
+
+    def check_body_size(self):
+        """Reject a declared Content-Length over the cap before reading anything"""
+        content_length = self.headers.get('Content-Length')
+        if content_length is None:
+            return
+        try:
+            size = int(content_length)
+        except ValueError:
+            raise RequestRejected(400, f'Invalid Content-Length: {content_length}')
+        if size < 0:
+            raise RequestRejected(400, f'Invalid Content-Length: {content_length}')
+        if size > self.body_size_limit():
+            raise RequestRejected(413, f'Request body too large ({size} bytes, limit {self.body_size_limit()})')
+
+    def iter_request_body(self):
+        """Yield the request body in chunks, decoding chunked transfer encoding"""
+        limit = self.body_size_limit()
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            received = 0
+            while True:
+                size_line = self.rfile.readline(65537)
+                try:
+                    size = int(size_line.split(b';')[0].strip(), 16)
+                except ValueError:
+                    raise ValueError(f"Malformed chunk header: {size_line[:40]!r}")
+                received += size
+                if received > limit:
+                    raise RequestRejected(413, f'Request body too large (limit {limit} bytes)')
+                if size == 0:
+                    # Skip optional trailers up to the terminating blank line
+                    while self.rfile.readline(65537) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return
+                remaining = size
+                while remaining > 0:
+                    data = self.rfile.read(min(remaining, UPLOAD_CHUNK_SIZE))
+                    if not data:
+                        raise ValueError("Connection closed mid-chunk")
+                    remaining -= len(data)
+                    yield data
+                self.rfile.readline()  # CRLF after chunk data
+        else:
+            remaining = int(self.headers.get('Content-Length', 0))
+            if remaining == 0:
+                raise ValueError("No data received")
+            while remaining > 0:
+                data = self.rfile.read(min(remaining, UPLOAD_CHUNK_SIZE))
+                if not data:
+                    raise ValueError("Connection closed before full body was received")
+                remaining -= len(data)
+                yield data
+
+    def handle_upload_progress(self):
+        """Report progress of a streamed quiz upload"""
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        quiz_id = query.get('quiz_id', [''])[0].strip()
+        with UPLOAD_PROGRESS_LOCK:
+            progress = dict(UPLOAD_PROGRESS.get(quiz_id, {}))
+        if progress:
+            self.send_json(200, {'success': True, 'quiz_id': quiz_id, **progress})
+        else:
+            self.send_json(404, {'success': False, 'error': f'No upload in progress for: {quiz_id}'})
+
+    def handle_bootstrap(self):
+        """Serve the precomputed page-load bundle.
+
+        Query parameters: set (defaults to the config's default set) and
+        limit, the number of that set's questions to include (0 by default,
+        "all" for the whole set).
+        """
+        try:
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            set_name = query.get('set', [''])[0].strip() or None
+            limit_param = query.get('limit', ['0'])[0].strip().lower()
+            if limit_param == 'all':
+                limit = None
+            elif limit_param.isdigit():
+                limit = int(limit_param)
+            else:
+                raise RequestRejected(400, f'Invalid limit: {limit_param}')
+
+            self.serve_cached(BOOTSTRAP_CACHE.get(set_name, limit), '/api/bootstrap')
+        except RequestRejected as e:
+            self.send_json(e.status, {'success': False, 'error': str(e)})
+        except Exception as e:
+            print(f"❌ Exception in handle_bootstrap: {e}")
+            self.send_json(500, {'success': False, 'error': str(e)})
+
+    def practice_params(self, learner, set_name):
+        """Validate learner and set, returning the set's PracticeIndex entry"""
+        if not LEARNER_ID_PATTERN.fullmatch(learner or ''):
+            raise RequestRejected(400, 'learner must be 1-64 letters, numbers, underscores or hyphens')
+        index = PRACTICE_INDEX.get(set_name)
+        if index is None:
+            raise RequestRejected(404, f'Quiz set not found: {set_name}')
+        return index
+
+    def handle_practice_next(self):
+        """Return the learner's next practice batch from a set.
+
+        Query parameters: learner, set and count (default 10). Due reviews
+        come first, then unseen questions, then reviews ahead of schedule.
+        """
+        try:
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            learner = query.get('learner', [''])[0].strip()
+            set_name = query.get('set', [''])[0].strip()
+            count_param = query.get('count', ['10'])[0].strip()
+            if not count_param.isdigit() or int(count_param) == 0:
+                raise RequestRejected(400, f'Invalid count: {count_param}')
+            count = min(int(count_param), MAX_PRACTICE_BATCH)
+
+            question_ids, by_id, content_hash = self.practice_params(learner, set_name)
+            batch = PRACTICE_SCHEDULER.next_questions(learner, set_name, question_ids, by_id, count,
+                                                      content_hash=content_hash)
+
+            questions = []
+            for question_id, kind, card in batch:
+                schedule = card.to_dict() if card else {}
+                schedule['kind'] = kind
+                questions.append(dict(by_id[question_id], schedule=schedule))
+
+            self.send_json(200, {'success': True, 'learner': learner, 'set': set_name, 'questions': questions})
+        except RequestRejected as e:
+            self.send_json(e.status, {'success': False, 'error': str(e)})
+        except Exception as e:
+            print(f"❌ Exception in handle_practice_next: {e}")
+            self.send_json(500, {'success': False, 'error': str(e)})
+
+    def handle_practice_answer(self):
+        """Grade one practice answer and reschedule the question.
+
+        JSON body: learner, set, question_id and selected (option indexes).
+        """
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            if content_length == 0:
+                raise RequestRejected(400, 'No data received')
+            try:
+                data = json.loads(self.rfile.read(content_length).decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                raise RequestRejected(400, f'Invalid JSON: {e}')
+            if not isinstance(data, dict):
+                raise RequestRejected(400, 'Request body must be a JSON object')
+
+            learner = str(data.get('learner', '')).strip()
+            set_name = str(data.get('set', '')).strip()
+            question_id = data.get('question_id')
+            selected = data.get('selected')
+
+            _, by_id, _ = self.practice_params(learner, set_name)
+            question = by_id.get(question_id) if isinstance(question_id, int) else None
+            if question is None:
+                raise RequestRejected(404, f'Question {question_id} not found in {set_name}')
+            if not isinstance(selected, list) or not all(isinstance(i, int) for i in selected):
+                raise RequestRejected(400, 'selected must be a list of option indexes')
+
+            correct = sorted(set(selected)) == sorted(question['correctAnswers'])
+            card = PRACTICE_SCHEDULER.record(learner, set_name, question_id, correct)
+            self.send_json(200, {'success': True, 'correct': correct, 'schedule': card.to_dict()})
+        except RequestRejected as e:
+            self.send_json(e.status, {'success': False, 'error': str(e)})
+        except Exception as e:
+            print(f"❌ Exception in handle_practice_answer: {e}")
+            self.send_json(500, {'success': False, 'error': str(e)})
+
+    def report_upload_progress(self, quiz_id, **fields):
+        with UPLOAD_PROGRESS_LOCK:
+            UPLOAD_PROGRESS.setdefault(quiz_id, {}).update(fields)
+
+    def handle_create_quiz_stream(self):
+        """Create a quiz from a raw text/plain or chunked upload.
+
+        Metadata comes from the query string (quiz_id, quiz_name, description).
+        The body is fed into the question parser as it arrives, and each question
+        is validated and appended to the output file as soon as it is complete.
+        """
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        quiz_id = query.get('quiz_id', [''])[0].strip()
+        quiz_name = query.get('quiz_name', [''])[0].strip()
+        description = query.get('description', [''])[0].strip()
+
+        print(f"📋 Quiz ID: {quiz_id}")
+        print(f"📋 Quiz Name: {quiz_name}")
+
+        if not quiz_id or not quiz_name:
+            missing = [name for name, value in (('quiz_id', quiz_id), ('quiz_name', quiz_name)) if not value]
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+        if not re.fullmatch(r'[a-zA-Z0-9_-]+', quiz_id):
+            raise ValueError("Quiz ID must contain only letters, numbers, underscores, and hyphens")
+
+        with UPLOAD_PROGRESS_LOCK:
+            if quiz_id in UPLOAD_PROGRESS:
+                raise RequestRejected(409, f'An upload for "{quiz_id}" is already in progress')
+            UPLOAD_PROGRESS[quiz_id] = {'status': 'receiving', 'bytes_received': 0, 'questions_found': 0,
+                                        'questions_written': 0, 'skipped': 0}
+
+        try:
+            automation = QuizAutomation()
+            parser = QuestionStreamParser(automation)
+            writer = automation.open_quiz_writer(quiz_id)
+        except Exception:
+            with UPLOAD_PROGRESS_LOCK:
+                UPLOAD_PROGRESS.pop(quiz_id, None)
+            raise
+
+        def write_questions(questions):
+            for question in questions:
+                automation.validate_question(question, writer.count + 1)
+                writer.write(question)
+            if questions:
+                self.report_upload_progress(quiz_id, bytes_received=parser.bytes_received,
+                                            questions_found=parser.total_found,
+                                            questions_written=writer.count,
+                                            skipped=len(parser.skipped_questions))
+                if writer.count % 100 < len(questions):
+                    print(f"📊 {quiz_id}: {writer.count} questions written ({parser.bytes_received} bytes)")
+
+        try:
+            for chunk in self.iter_request_body():
+                write_questions(parser.feed(chunk))
+            write_questions(parser.close())
+            parser.print_summary()
+
+            if writer.count == 0:
+                raise ValueError("No valid questions found in upload")
+
+            self.report_upload_progress(quiz_id, status='saving')
+            with CONFIG_LOCK:
+                output_file = writer.commit()
+                # A set previously appended to would otherwise keep serving its old .jsonl
+                with JSONL_LOCK:
+                    automation.remove_jsonl(quiz_id)
+                automation.update_config(output_file, writer.count, quiz_name, description or None)
+        except Exception:
+            writer.abort()
+            raise
+        finally:
+            with UPLOAD_PROGRESS_LOCK:
+                UPLOAD_PROGRESS.pop(quiz_id, None)
+
+        print(f"✅ Streamed quiz saved: {output_file} ({writer.count} questions)")
+        return {
+            'success': True,
+            'message': f'Quiz "{quiz_name}" created successfully!',
+            'questions_processed': writer.count,
+            'questions_skipped': len(parser.skipped_questions),
+            'bytes_received': parser.bytes_received,
+            'output': f'Quiz created with {writer.count} questions'
+        }
+
+    def handle_append_questions(self):
+        """Append questions to an existing quiz set stored as JSON Lines.
+
+        The text/plain body uses the same question format as quiz creation and
+        quiz_id is taken from the query string. A .json set is converted to
+        JSONL on its first append; compaction runs later in the background.
+        """
+        try:
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            quiz_id = query.get('quiz_id', [''])[0].strip()
+            print(f"➕ Appending questions to: {quiz_id}")
+
+            if not re.fullmatch(r'[a-zA-Z0-9_-]+', quiz_id):
+                raise ValueError("Quiz ID must contain only letters, numbers, underscores, and hyphens")
+
+            automation = QuizAutomation()
+            parser = QuestionStreamParser(automation)
+            questions = []
+            for chunk in self.iter_request_body():
+                questions.extend(parser.feed(chunk))
+            questions.extend(parser.close())
+            parser.print_summary()
+
+            if not questions:
+                raise ValueError("No valid questions found in upload")
+
+            with JSONL_LOCK:
+                index = automation.append_questions(questions, quiz_id)
+            COMPACTOR.schedule(quiz_id, index)
+
+            self.send_json(200, {
+                'success': True,
+                'message': f'Appended {len(questions)} questions',
+                'questions_appended': len(questions),
+                'questions_skipped': len(parser.skipped_questions),
+                'question_count': index['count']
+            })
+
+        except RequestRejected:
+            raise
+        except Exception as e:
+            print(f"❌ Exception in handle_append_questions: {e}")
+            self.send_json(500, {'success': False, 'error': str(e)})
+
     def handle_create_quiz(self):
         """Handle quiz creation API"""
         try:
+            if self.is_streaming_upload():
+                print("🔄 Processing streamed quiz upload...")
+                self.send_json(200, self.handle_create_quiz_stream())
+                return
+            
             print("🔄 Processing quiz creation...")
             
             # Read JSON data
@@ -160,16 +1077,20 @@ python quiz_automation.py "{filename}" "{quiz_id}" "{quiz_name}" "{description}"
                 f.write(batch_content)
             
             try:
-                result = subprocess.run(
-                    [batch_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                    shell=True,
-                    env=env,
-                    encoding='utf-8',
-                    errors='replace'
-                )
+                # Hold the config lock so the script's config update can't race other writers
+                with CONFIG_LOCK:
+                    result = subprocess.run(
+                        [batch_file],
+                        capture_output=True,
+                        text=True,
+                        timeout=30,
+                        shell=True,
+                        env=env,
+                        encoding='utf-8',
+                        errors='replace',
+                        # Keep conversions from competing with quiz page requests
+                        creationflags=getattr(subprocess, 'BELOW_NORMAL_PRIORITY_CLASS', 0)
+                    )
                 
                 print(f"📤 Exit code: {result.returncode}")
                 if result.stdout:
@@ -234,6 +1155,8 @@ python quiz_automation.py "{filename}" "{quiz_id}" "{quiz_name}" "{description}"
             self.wfile.write(response_json.encode())
             print(f"📡 Response sent: {len(response_json)} bytes")
             
+        except RequestRejected:
+            raise
         except Exception as e:
             print(f"❌ Exception in handle_create_quiz: {e}")
             response = {'success': False, 'error': str(e)}
@@ -278,36 +1201,50 @@ python quiz_automation.py "{filename}" "{quiz_id}" "{quiz_name}" "{description}"
             quiz_file_path = os.path.join('assets', 'data', filename)
             config_file_path = os.path.join('assets', 'data', 'quiz-config.json')
             
+            # JSONL sets are listed under their .json name
+            jsonl_files = []
+            if filename.startswith('quiz_') and filename.endswith('.json'):
+                automation = QuizAutomation()
+                output_name = filename[len('quiz_'):-len('.json')]
+                jsonl_files = [str(path) for path in automation.jsonl_paths(output_name) if path.exists()]
+            
             # Check if quiz file exists
-            if not os.path.exists(quiz_file_path):
+            if not os.path.exists(quiz_file_path) and not jsonl_files:
                 raise ValueError(f"Quiz file not found: {quiz_file_path}")
             
             # Check if config file exists
             if not os.path.exists(config_file_path):
                 raise ValueError(f"Config file not found: {config_file_path}")
             
-            # Read and update config file
-            print("📝 Updating configuration...")
-            with open(config_file_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            # Remove quiz from config
-            if 'quiz-sets' in config and filename in config['quiz-sets']:
-                del config['quiz-sets'][filename]
-                config['metadata']['total_quiz_sets'] = len(config['quiz-sets'])
-                config['metadata']['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                print(f"✅ Removed {filename} from configuration")
-            else:
-                print(f"⚠️  Quiz {filename} not found in configuration")
+            with CONFIG_LOCK:
+                # Read and update config file
+                print("📝 Updating configuration...")
+                with open(config_file_path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            
+                # Remove quiz from config
+                if 'quiz-sets' in config and filename in config['quiz-sets']:
+                    del config['quiz-sets'][filename]
+                    config['metadata']['total_quiz_sets'] = len(config['quiz-sets'])
+                    config['metadata']['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    print(f"✅ Removed {filename} from configuration")
+                else:
+                    print(f"⚠️  Quiz {filename} not found in configuration")
             
-            # Save updated config
-            with open(config_file_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
-            print("✅ Configuration updated successfully")
+                # Save updated config
+                with open(config_file_path, 'w', encoding='utf-8') as f:
+                    json.dump(config, f, indent=2, ensure_ascii=False)
+                print("✅ Configuration updated successfully")
             
-            # Delete quiz file
-            os.remove(quiz_file_path)
-            print(f"✅ Deleted quiz file: {quiz_file_path}")
+                # Delete quiz file
+                if os.path.exists(quiz_file_path):
+                    os.remove(quiz_file_path)
+                    print(f"✅ Deleted quiz file: {quiz_file_path}")
+                if jsonl_files:
+                    # Under the set's lock file too, so a CLI append can't race the delete
+                    with JSONL_LOCK:
+                        automation.remove_jsonl(output_name)
+                    print(f"✅ Deleted JSONL files: {', '.join(jsonl_files)}")
             
             # Prepare success response
             response = {
@@ -356,16 +1293,27 @@ def main():
     print(f"🏠 Quiz App: http://localhost:{port}")
     print(f"⚙️  Config Page: http://localhost:{port}/config")
     print(f"🔧 API Endpoint: http://localhost:{port}/api/create-quiz")
+    print(f"🧭 Bootstrap: http://localhost:{port}/api/bootstrap")
     print("=" * 60)
     print("✅ Features:")
     print("   • Complete encoding support for Windows")
     print("   • Batch file automation for proper UTF-8 handling")
     print("   • Robust error handling and validation")
     print("   • File cleanup and proper responses")
+    print("   • Streamed text/plain uploads with incremental parsing")
+    print("   • Append-only JSONL quiz sets with background compaction")
+    print("   • Single-request page load via /api/bootstrap")
+    print("   • Adaptive spaced-repetition practice via /api/practice/next")
+    print(f"   • Live reload of assets/data/ (polled every {WATCH_INTERVAL:g}s)")
+    print(f"   • Admin operations: {ADMIN_CONCURRENCY} at a time, {ADMIN_QUEUE_SIZE} queued, "
+          f"{ADMIN_RATE_PER_MINUTE:g}/min per client")
     print("=" * 60)
     
     try:
-        httpd = HTTPServer(server_address, FinalWorkingHandler)
+        httpd = ThreadingHTTPServer(server_address, FinalWorkingHandler)
+        QUIZ_CACHE.start()
+        PRACTICE_SCHEDULER.load()
+        COMPACTOR.start()
         print(f"🎯 Server running! Visit http://localhost:{port}/config")
         print("📋 All requests will be logged below:")
         print("-" * 60)
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Spaced-Repetition Practice Scheduler
+Tracks an ease and due time per learner and question (SM-2 style) and picks
+what to practice next: overdue reviews first, then questions the learner has
+not seen yet, then the reviews coming up soonest.
+
+Attempts are appended to a tab-separated log, one short line each. Every
+SNAPSHOT_EVERY attempts the log is started afresh and the card state is
+written to a snapshot file in the background, so startup loads the snapshot
+and replays only the attempts made since.
+"""
+
+import heapq
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+
+MINUTE = 60
+DAY = 24 * 60 * MINUTE
+
+START_EASE = 2.5
+MIN_EASE = 1.3
+LAPSE_PENALTY = 0.2
+LEARNING_STEP = 10 * MINUTE  # a missed question comes back after this long
+
+# Attempts logged between snapshots of the card state
+SNAPSHOT_EVERY = 10000
+
+
+class Card:
+    """Schedule of one question for one learner"""
+
+    __slots__ = ('due', 'interval', 'ease', 'reps', 'lapses')
+
+    def __init__(self):
+        self.due = 0.0
+        self.interval = 0.0
+        self.ease = START_EASE
+        self.reps = 0
+        self.lapses = 0
+
+    def review(self, correct, now):
+        if correct:
+            self.reps += 1
+            if self.reps == 1:
+                self.interval = DAY
+            elif self.reps == 2:
+                self.interval = 6 * DAY
+            else:
+                self.interval *= self.ease
+        else:
+            self.reps = 0
+            self.lapses += 1
+            self.interval = LEARNING_STEP
+            self.ease = max(MIN_EASE, self.ease - LAPSE_PENALTY)
+        self.due = now + self.interval
+
+    def to_dict(self):
+        return {
+            'due': int(self.due),
+            'interval': int(self.interval),
+            'ease': round(self.ease, 2),
+            'reps': self.reps,
+            'lapses': self.lapses
+        }
+
+
+class LearnerDeck:
+    """One learner's cards for one quiz set.
+
+    `heap` holds (due, question_id) for every card. Entries are never removed
+    when a card is rescheduled; a fresh one is pushed and the old one is
+    recognised as stale (its due no longer matches the card) when popped.
+
+    Unseen questions are handed out by `new_cursor`, which only moves forward
+    through the set. Every position behind it has been answered or is waiting
+    in `new_pending` (offered as new but not answered yet).
+    """
+
+    __slots__ = ('cards', 'heap', 'new_cursor', 'new_pending', 'new_content_hash')
+
+    def __init__(self):
+        self.cards = {}
+        self.heap = []
+        self.new_cursor = 0
+        self.new_pending = []
+        self.new_content_hash = None
+
+    def record(self, question_id, correct, now):
+        card = self.cards.get(question_id)
+        if card is None:
+            card = self.cards[question_id] = Card()
+        card.review(correct, now)
+        heapq.heappush(self.heap, (card.due, question_id))
+
+        # Drop stale entries once they outnumber the live ones
+        if len(self.heap) > 2 * len(self.cards) + 16:
+            self.rebuild_heap()
+        return card
+
+    def rebuild_heap(self):
+        self.heap = [(card.due, question_id) for question_id, card in self.cards.items()]
+        heapq.heapify(self.heap)
+
+    def next_batch(self, question_ids, valid_ids, count, now, offset, content_hash=None):
+        """Pick up to `count` question ids as (question_id, kind) pairs.
+
+        question_ids is the set's ids in file order and valid_ids supports
+        fast membership tests. Unseen questions are introduced in file order
+        rotated by `offset`, so learners don't all start on the same question.
+        The new-question cursor restarts when `content_hash` changes. Costs
+        O(count log n) amortised, apart from skipping stale heap entries.
+        """
+        batch = []
+        chosen = set()
+        held = []
+
+        def take_from_heap(due_only):
+            while self.heap and len(batch) < count:
+                if due_only and self.heap[0][0] > now:
+                    return
+                entry = heapq.heappop(self.heap)
+                card = self.cards.get(entry[1])
+                if card is None or card.due != entry[0]:
+                    continue
+                held.append(entry)
+                if entry[1] in valid_ids and entry[1] not in chosen:
+                    batch.append((entry[1], 'due' if entry[0] <= now else 'ahead'))
+                    chosen.add(entry[1])
+
+        # 1. Reviews that are due
+        take_from_heap(due_only=True)
+
+        # 2. Questions never answered: those offered before first, then onwards from the cursor
+        size = len(question_ids)
+        if size and len(batch) < count:
+            if self.new_content_hash != content_hash:
+                # The set changed; rescan from the start
+                self.new_cursor, self.new_pending, self.new_content_hash = 0, [], content_hash
+            self.new_pending = [question_id for question_id in self.new_pending
+                                if question_id not in self.cards and question_id in valid_ids]
+            for question_id in self.new_pending:
+                if len(batch) >= count:
+                    break
+                batch.append((question_id, 'new'))
+                chosen.add(question_id)
+            while len(batch) < count and self.new_cursor < size:
+                question_id = question_ids[(offset + self.new_cursor) % size]
+                self.new_cursor += 1
+                if question_id not in self.cards:
+                    self.new_pending.append(question_id)
+                    batch.append((question_id, 'new'))
+                    chosen.add(question_id)
+
+        # 3. Nothing else left: review ahead of schedule, soonest first
+        take_from_heap(due_only=False)
+
+        # Selection doesn't answer anything, so everything taken stays scheduled
+        for entry in held:
+            heapq.heappush(self.heap, entry)
+        return batch
+
+
+class PracticeScheduler:
+    """Spaced-repetition state for all learners, persisted as a snapshot plus an attempt log.
+
+    Each log file starts with a line naming its epoch, and the snapshot
+    header maps every epoch it covers to the number of bytes covered, so
+    replay skips exactly what the snapshot already holds. To snapshot, the
+    log is moved aside to <log>.prev and a new one started; a background
+    thread then writes the cards as they were at that moment (decks answered
+    in the meantime are copied first) and removes <log>.prev when done.
+    """
+
+    def __init__(self, log_path, snapshot_path=None):
+        self.log_path = log_path
+        self.prev_log_path = log_path + '.prev'
+        self.snapshot_path = snapshot_path or os.path.splitext(log_path)[0] + '.cards.jsonl'
+        self.decks = {}
+        self.lock = threading.Lock()
+        self.log_file = None
+        self.log_epoch = ''
+        self.log_size = 0
+        self.logged_since_snapshot = 0
+        self.snapshot_thread = None
+        self.snapshot_pending = set()
+        self.snapshot_saved = {}
+
+    def load(self):
+        """Rebuild card state from the snapshot and the attempts logged after it"""
+        covered = self.load_snapshot()
+
+        attempts = 0
+        replayed_logs = {}
+        for path in (self.prev_log_path, self.log_path):
+            if os.path.exists(path):
+                epoch, size, replayed = self.replay_log(path, covered)
+                attempts += replayed
+                replayed_logs[epoch] = size
+                if path == self.log_path:
+                    self.log_epoch, self.log_size = epoch, size
+        self.logged_since_snapshot = attempts
+
+        print(f"🧠 Practice scheduler: {attempts} attempts replayed, {len(self.decks)} learner decks")
+        if os.path.exists(self.prev_log_path):
+            # An earlier snapshot didn't finish; cover both logs now, before any requests arrive
+            rows = ([learner, set_name, question_id, card.due, card.interval, card.ease, card.reps, card.lapses]
+                    for (learner, set_name), deck in self.decks.items()
+                    for question_id, card in deck.cards.items())
+            self.write_snapshot(replayed_logs, rows)
+            os.remove(self.prev_log_path)
+            self.logged_since_snapshot = 0
+        elif attempts >= SNAPSHOT_EVERY:
+            with self.lock:
+                self.start_snapshot()
+        return attempts
+
+    def load_snapshot(self):
+        """Load card state from the snapshot; returns {log epoch: bytes covered}"""
+        try:
+            file = open(self.snapshot_path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return {}
+        with file:
+            header = json.loads(file.readline())
+            for line in file:
+                learner, set_name, question_id, due, interval, ease, reps, lapses = json.loads(line)
+                card = Card()
+                card.due, card.interval, card.ease, card.reps, card.lapses = due, interval, ease, reps, lapses
+                self.deck(learner, set_name).cards[question_id] = card
+        for deck in self.decks.values():
+            deck.rebuild_heap()
+        return header['epochs']
+
+    def replay_log(self, path, covered):
+        """Apply the attempts in one log file past what the snapshot covers; returns (epoch, size, attempts)"""
+        attempts = 0
+        with open(path, 'rb') as file:
+            first_line = file.readline()
+            if first_line.startswith(b'#epoch\t') and first_line.endswith(b'\n'):
+                epoch = first_line[len(b'#epoch\t'):-1].decode('ascii')
+            else:
+                epoch = ''  # log from before snapshots existed
+                file.seek(0)
+            file.seek(max(covered.get(epoch, 0), file.tell()))
+            for raw_line in file:
+                fields = raw_line.decode('utf-8', 'replace').rstrip('\n').split('\t')
+                if len(fields) != 5 or not raw_line.endswith(b'\n'):
+                    continue  # torn final line from an interrupted write
+                try:
+                    timestamp, learner, set_name, question_id, correct = fields
+                    self.deck(learner, set_name).record(int(question_id), correct == '1', float(timestamp))
+                except ValueError:
+                    continue
+                attempts += 1
+            return epoch, file.tell(), attempts
+
+    def write_snapshot(self, covered, rows):
+        """Write the snapshot header and card rows to a temp file and move it into place"""
+        snapshot_dir = os.path.dirname(self.snapshot_path) or '.'
+        os.makedirs(snapshot_dir, exist_ok=True)
+        fd, temp_file = tempfile.mkstemp(dir=snapshot_dir, prefix=os.path.basename(self.snapshot_path) + '.',
+                                         suffix='.part')
+        cards = 0
+        with open(fd, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({'epochs': covered}) + '\n')
+            for row in rows:
+                file.write(json.dumps(row) + '\n')
+                cards += 1
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_file, self.snapshot_path)
+        print(f"🧠 Practice snapshot written: {cards} cards")
+
+    def start_snapshot(self):
+        """Move the log aside and snapshot the cards in the background. Call with the lock held."""
+        if self.snapshot_thread is not None:
+            return
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+        if not os.path.exists(self.log_path):
+            return
+        covered = {self.log_epoch: self.log_size}
+        os.replace(self.log_path, self.prev_log_path)
+        self.log_size = 0  # record() starts the new log with a fresh epoch
+        self.logged_since_snapshot = 0
+        self.snapshot_pending = set(self.decks)
+        self.snapshot_saved = {}
+        self.snapshot_thread = threading.Thread(target=self.finish_snapshot, args=(covered, list(self.decks)),
+                                                name='practice-snapshot', daemon=True)
+        self.snapshot_thread.start()
+
+    def preserve_for_snapshot(self, key):
+        """Copy a deck's cards before its first change since start_snapshot(). Call with the lock held."""
+        if key in self.snapshot_pending:
+            self.snapshot_pending.discard(key)
+            self.snapshot_saved[key] = [(question_id, card.due, card.interval, card.ease, card.reps, card.lapses)
+                                        for question_id, card in self.decks[key].cards.items()]
+
+    def finish_snapshot(self, covered, keys):
+        def rows():
+            for key in keys:
+                with self.lock:
+                    self.preserve_for_snapshot(key)
+                    cards = self.snapshot_saved.pop(key, [])
+                learner, set_name = key
+                for card in cards:
+                    yield [learner, set_name, *card]
+
+        try:
+            self.write_snapshot(covered, rows())
+            os.remove(self.prev_log_path)
+        except Exception as e:
+            print(f"⚠️  Practice snapshot failed, attempts stay in {self.prev_log_path}: {e}")
+        finally:
+            with self.lock:
+                self.snapshot_pending, self.snapshot_saved = set(), {}
+                self.snapshot_thread = None
+
+    def deck(self, learner, set_name):
+        key = (learner, set_name)
+        deck = self.decks.get(key)
+        if deck is None:
+            deck = self.decks[key] = LearnerDeck()
+        return deck
+
+    def record(self, learner, set_name, question_id, correct, now=None):
+        """Apply one attempt and append it to the log; returns the updated Card"""
+        now = int(time.time()) if now is None else now
+        with self.lock:
+            self.preserve_for_snapshot((learner, set_name))
+            card = self.deck(learner, set_name).record(question_id, correct, now)
+            if self.log_file is None:
+                os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+                self.log_file = open(self.log_path, 'ab')
+                if self.log_file.tell() == 0:
+                    self.log_epoch = os.urandom(8).hex()
+                    header = f"#epoch\t{self.log_epoch}\n".encode('ascii')
+                    self.log_file.write(header)
+                    self.log_size = len(header)
+            line = f"{now}\t{learner}\t{set_name}\t{question_id}\t{1 if correct else 0}\n".encode('utf-8')
+            self.log_file.write(line)
+            self.log_file.flush()
+            self.log_size += len(line)
+            self.logged_since_snapshot += 1
+            if self.logged_since_snapshot >= SNAPSHOT_EVERY:
+                self.start_snapshot()
+        return card
+
+    def next_questions(self, learner, set_name, question_ids, valid_ids, count, now=None, content_hash=None):
+        """Return [(question_id, kind, card_or_None)] for the learner's next batch.
+
+        Learners without answers get a throwaway deck; only record() stores decks.
+        """
+        now = time.time() if now is None else now
+        offset = zlib.crc32(learner.encode('utf-8'))
+        with self.lock:
+            deck = self.decks.get((learner, set_name)) or LearnerDeck()
+            batch = deck.next_batch(question_ids, valid_ids, count, now, offset, content_hash)
+            return [(question_id, kind, deck.cards.get(question_id)) for question_id, kind in batch]
@@ -4,7 +4,9 @@
 AWS Quiz Automation Script
 Converts questions.txt to JSON format, validates it, and updates configuration.
 
-Usage: python quiz_automation.py [questions_file.txt] [output_name]
+Usage: python quiz_automation.py [questions_file.txt] [output_name] [quiz_name] [description] [--jsonl]
+       python quiz_automation.py append [questions_file.txt] [output_name]
+       python quiz_automation.py compact [output_name]
 Example: python quiz_automation.py questions.txt new_quiz
 """
 
@@ -47,10 +49,145 @@ if sys.platform == "win32":
                 original_print(*[str(arg).encode('ascii', 'ignore').decode('ascii') for arg in args], **kwargs)
         builtins.print = safe_print
 
+import codecs
 import re
+import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+# How long to wait for another process's JSONL lock, and when to treat one as left behind by a crash
+JSONL_LOCK_TIMEOUT = 30
+JSONL_LOCK_STALE_AGE = 600
+
+class QuestionStreamParser:
+    """Incrementally split question text into parsed question objects.
+    
+    Text may be fed in arbitrary chunks (str, or UTF-8 bytes straight off a
+    socket). A question is parsed and returned as soon as the next question
+    header is seen, so only the current block is ever buffered.
+    """
+    
+    HEADER_PATTERN = re.compile(r'^\s*(?:Question\s*#?:?\s*(\d+)|Question\s*#?\s*(\d+):|(\d+)\.)\s*(.*)$')
+    
+    def __init__(self, automation):
+        self.automation = automation
+        self.decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.pending = ''
+        self.current_num = None
+        self.current_lines = []
+        self.bytes_received = 0
+        self.total_found = 0
+        self.parsed_count = 0
+        self.skipped_questions = []
+    
+    def feed(self, chunk):
+        """Feed more text, returning the questions completed by it"""
+        if isinstance(chunk, bytes):
+            self.bytes_received += len(chunk)
+            chunk = self.decoder.decode(chunk)
+        
+        lines = (self.pending + chunk).split('\n')
+        self.pending = lines.pop()
+        
+        completed = []
+        for line in lines:
+            question = self._feed_line(line.rstrip('\r'))
+            if question:
+                completed.append(question)
+        return completed
+    
+    def close(self):
+        """Flush buffered text and return any remaining questions"""
+        completed = self.feed(self.decoder.decode(b'', final=True) + '\n')
+        question = self._finish_current()
+        if question:
+            completed.append(question)
+        return completed
+    
+    def print_summary(self):
+        print(f"📊 Total questions found: {self.total_found}")
+        print(f"✅ Successfully parsed: {self.parsed_count} questions")
+        if self.skipped_questions:
+            skipped = self.skipped_questions
+            print(f"⚠️  Skipped questions: {len(skipped)} - {skipped[:10]}{'...' if len(skipped) > 10 else ''}")
+    
+    def _feed_line(self, line):
+        header_match = self.HEADER_PATTERN.match(line)
+        if not header_match:
+            if self.current_num is not None:
+                self.current_lines.append(line)
+            return None
+        
+        # A new header closes the previous block
+        question = self._finish_current()
+        self.current_num = header_match.group(1) or header_match.group(2) or header_match.group(3)
+        self.current_lines = [header_match.group(4)]
+        return question
+    
+    def _finish_current(self):
+        question_num = self.current_num
+        block = '\n'.join(self.current_lines).strip()
+        self.current_num = None
+        self.current_lines = []
+        
+        if not question_num or not block:
+            return None
+        
+        self.total_found += 1
+        try:
+            question_data = self.automation._parse_single_question(block, int(question_num))
+        except Exception as e:
+            self.skipped_questions.append(int(question_num))
+            print(f"⚠️  Warning: Failed to parse question {question_num}: {e}")
+            return None
+        
+        if not question_data:
+            self.skipped_questions.append(int(question_num))
+            print(f"⚠️  Skipped question {question_num}: insufficient content")
+            return None
+        
+        self.parsed_count += 1
+        return question_data
+
+class QuizJsonWriter:
+    """Write a quiz JSON array one question at a time.
+    
+    Output goes to a uniquely named .part file next to the target and is
+    only moved into place by commit(), so an interrupted conversion never
+    leaves a half-written quiz in assets/data/ and two writers for the same
+    set never share a temp file.
+    """
+    
+    def __init__(self, output_file):
+        self.output_file = Path(output_file)
+        self.file = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.output_file.parent,
+                                                prefix=self.output_file.name + '.', suffix='.part',
+                                                delete=False)
+        self.temp_file = self.file.name
+        self.count = 0
+    
+    def write(self, question):
+        # Same layout as json.dump(questions, indent=2)
+        text = json.dumps(question, indent=2, ensure_ascii=False)
+        self.file.write('[\n' if self.count == 0 else ',\n')
+        self.file.write('\n'.join('  ' + line for line in text.split('\n')))
+        self.count += 1
+    
+    def commit(self):
+        self.file.write('\n]' if self.count else '[]')
+        self.file.close()
+        os.replace(self.temp_file, self.output_file)
+        return self.output_file
+    
+    def abort(self):
+        self.file.close()
+        try:
+            os.remove(self.temp_file)
+        except OSError:
+            pass
+
 class QuizAutomation:
     def __init__(self):
         self.base_dir = Path(__file__).parent
@@ -61,57 +198,27 @@ class QuizAutomation:
         """Convert questions.txt to JSON format"""
         print(f"📖 Reading questions from: {file_path}")
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read().strip()
-        except FileNotFoundError:
-            raise FileNotFoundError(f"❌ File not found: {file_path}")
-        except Exception as e:
-            raise Exception(f"❌ Error reading file: {e}")
-        
         # Handle multiple question formats:
         # - "Question #: 1" (number after colon)
         # - "Question 1:" (number before colon) 
         # - "1." (simple numbering)
-        # Add newline at start to ensure first question is captured
-        content = '\n' + content
-        question_pattern = r'\n\s*(?:Question\s*#?:?\s*(\d+)|Question\s*#?\s*(\d+):|(\d+)\.)\s*'
-        parts = re.split(question_pattern, content)
-        
+        # The file is fed line by line so only one question block is held in memory
+        parser = QuestionStreamParser(self)
         questions = []
-        skipped_questions = []
-        total_found = 0
         
-        # Process each question block - start from index 1 (skip empty first part)
-        # With 3 capture groups for question numbers, we have 4 parts per question (3 groups + content)
-        for i in range(1, len(parts), 4):
-            if i + 3 < len(parts):
-                try:
-                    # Get question number from any of the three capture groups
-                    question_num = parts[i] or parts[i + 1] or parts[i + 2]
-                    question_content = parts[i + 3]
-                    
-                    if question_num and question_content:
-                        total_found += 1
-                        question_data = self._parse_single_question(question_content, int(question_num))
-                        if question_data:
-                            questions.append(question_data)
-                        else:
-                            skipped_questions.append(int(question_num))
-                            print(f"⚠️  Skipped question {question_num}: insufficient content")
-                except Exception as e:
-                    if question_num:
-                        skipped_questions.append(int(question_num))
-                        print(f"⚠️  Warning: Failed to parse question {question_num}: {e}")
-                    continue
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    questions.extend(parser.feed(line))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"❌ File not found: {file_path}")
+        except Exception as e:
+            raise Exception(f"❌ Error reading file: {e}")
         
-        print(f"📊 Total questions found: {total_found}")
-        print(f"✅ Successfully parsed: {len(questions)} questions")
-        if skipped_questions:
-            print(f"⚠️  Skipped questions: {len(skipped_questions)} - {skipped_questions[:10]}{'...' if len(skipped_questions) > 10 else ''}")
+        questions.extend(parser.close())
+        parser.print_summary()
         
         return questions
-        return questions
     
     def _parse_single_question(self, block, question_id):
         """Parse a single question block including explanation"""
@@ -207,41 +314,8 @@ class QuizAutomation:
         if len(questions_data) == 0:
             raise ValueError("❌ No questions found in data")
         
-        required_fields = ['id', 'question', 'options', 'correctAnswers', 'multiple']
-        optional_fields = ['explanation']
-        
         for i, question in enumerate(questions_data):
-            # Check required fields
-            for field in required_fields:
-                if field not in question:
-                    raise ValueError(f"❌ Question {i+1} missing required field: {field}")
-            
-            # Validate field types
-            if not isinstance(question['id'], int):
-                raise ValueError(f"❌ Question {i+1}: 'id' must be integer")
-            
-            if not isinstance(question['question'], str) or not question['question'].strip():
-                raise ValueError(f"❌ Question {i+1}: 'question' must be non-empty string")
-            
-            if not isinstance(question['options'], list) or len(question['options']) < 2:
-                raise ValueError(f"❌ Question {i+1}: 'options' must be list with at least 2 items")
-            
-            if not isinstance(question['correctAnswers'], list) or len(question['correctAnswers']) == 0:
-                raise ValueError(f"❌ Question {i+1}: 'correctAnswers' must be non-empty list")
-            
-            # Validate correct answer indices
-            max_index = len(question['options']) - 1
-            for answer_idx in question['correctAnswers']:
-                if not isinstance(answer_idx, int) or answer_idx < 0 or answer_idx > max_index:
-                    raise ValueError(f"❌ Question {i+1}: Invalid answer index {answer_idx}")
-            
-            # Validate multiple flag
-            if not isinstance(question['multiple'], bool):
-                raise ValueError(f"❌ Question {i+1}: 'multiple' must be boolean")
-            
-            # Validate optional explanation field
-            if 'explanation' in question and not isinstance(question['explanation'], str):
-                raise ValueError(f"❌ Question {i+1}: 'explanation' must be string")
+            self.validate_question(question, i + 1)
         
         # Count questions with explanations
         with_explanations = sum(1 for q in questions_data if 'explanation' in q and q['explanation'])
@@ -249,6 +323,44 @@ class QuizAutomation:
         print(f"📝 Questions with explanations: {with_explanations}/{len(questions_data)}")
         return True
     
+    def validate_question(self, question, position):
+        """Validate a single question object (position is 1-based, used in error messages)"""
+        required_fields = ['id', 'question', 'options', 'correctAnswers', 'multiple']
+        
+        # Check required fields
+        for field in required_fields:
+            if field not in question:
+                raise ValueError(f"❌ Question {position} missing required field: {field}")
+        
+        # Validate field types
+        if not isinstance(question['id'], int):
+            raise ValueError(f"❌ Question {position}: 'id' must be integer")
+        
+        if not isinstance(question['question'], str) or not question['question'].strip():
+            raise ValueError(f"❌ Question {position}: 'question' must be non-empty string")
+        
+        if not isinstance(question['options'], list) or len(question['options']) < 2:
+            raise ValueError(f"❌ Question {position}: 'options' must be list with at least 2 items")
+        
+        if not isinstance(question['correctAnswers'], list) or len(question['correctAnswers']) == 0:
+            raise ValueError(f"❌ Question {position}: 'correctAnswers' must be non-empty list")
+        
+        # Validate correct answer indices
+        max_index = len(question['options']) - 1
+        for answer_idx in question['correctAnswers']:
+            if not isinstance(answer_idx, int) or answer_idx < 0 or answer_idx > max_index:
+                raise ValueError(f"❌ Question {position}: Invalid answer index {answer_idx}")
+        
+        # Validate multiple flag
+        if not isinstance(question['multiple'], bool):
+            raise ValueError(f"❌ Question {position}: 'multiple' must be boolean")
+        
+        # Validate optional explanation field
+        if 'explanation' in question and not isinstance(question['explanation'], str):
+            raise ValueError(f"❌ Question {position}: 'explanation' must be string")
+        
+        return True
+    
     def save_quiz_json(self, questions_data, output_name):
         """Save questions to JSON file"""
         output_file = self.data_dir / f"quiz_{output_name}.json"
@@ -256,14 +368,294 @@ class QuizAutomation:
         print(f"💾 Saving quiz to: {output_file}")
         
         try:
-            with open(output_file, 'w', encoding='utf-8') as file:
-                json.dump(questions_data, file, indent=2, ensure_ascii=False)
+            writer = QuizJsonWriter(output_file)
+            try:
+                for question in questions_data:
+                    writer.write(question)
+                writer.commit()
+            except Exception:
+                writer.abort()
+                raise
             
             print(f"✅ Quiz saved successfully: {output_file}")
             return output_file
         except Exception as e:
             raise Exception(f"❌ Failed to save JSON file: {e}")
     
+    def open_quiz_writer(self, output_name):
+        """Open an incremental writer for quiz_<output_name>.json"""
+        return QuizJsonWriter(self.data_dir / f"quiz_{output_name}.json")
+    
+    def jsonl_paths(self, output_name):
+        """Return (quiz_<name>.jsonl, quiz_<name>.jsonl.idx) for a JSONL quiz set"""
+        jsonl_file = self.data_dir / f"quiz_{output_name}.jsonl"
+        return jsonl_file, jsonl_file.with_name(jsonl_file.name + '.idx')
+    
+    def quiz_source_file(self, json_file):
+        """Return the file holding a set's current questions.
+        
+        A JSONL set keeps its quiz_<name>.json as a snapshot from the last
+        compaction, so the .jsonl append log is authoritative - unless the
+        .json is strictly newer, i.e. it was regenerated or edited since.
+        """
+        json_file = Path(json_file)
+        jsonl_file = json_file.with_name(json_file.name + 'l')
+        try:
+            jsonl_mtime = jsonl_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return json_file
+        try:
+            if json_file.stat().st_mtime_ns > jsonl_mtime:
+                return json_file
+        except FileNotFoundError:
+            pass
+        return jsonl_file
+    
+    @contextmanager
+    def jsonl_lock(self, output_name):
+        """Hold quiz_<name>.jsonl.lock so appends and compactions from other processes wait.
+        
+        The lock file is created with O_EXCL; one older than JSONL_LOCK_STALE_AGE
+        is assumed to be left over from a crashed process and is removed.
+        """
+        jsonl_file, _ = self.jsonl_paths(output_name)
+        lock_file = jsonl_file.with_name(jsonl_file.name + '.lock')
+        deadline = time.monotonic() + JSONL_LOCK_TIMEOUT
+        while True:
+            try:
+                fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock_file.stat().st_mtime > JSONL_LOCK_STALE_AGE:
+                        print(f"⚠️  Removing stale lock {lock_file.name}")
+                        os.remove(lock_file)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"❌ {lock_file.name} is held by another process")
+                time.sleep(0.05)
+        try:
+            os.write(fd, str(os.getpid()).encode('ascii'))
+            os.close(fd)
+            yield
+        finally:
+            os.remove(lock_file)
+    
+    def _temp_file_for(self, target):
+        """Open a uniquely named temp file next to `target` for an atomic os.replace"""
+        return tempfile.mkstemp(dir=self.data_dir, prefix=Path(target).name + '.', suffix='.part')
+    
+    def save_quiz_jsonl(self, questions_data, output_name):
+        """Save questions as JSON Lines (one question per line) plus its index"""
+        jsonl_file, _ = self.jsonl_paths(output_name)
+        
+        print(f"💾 Saving quiz to: {jsonl_file}")
+        
+        try:
+            size = 0
+            fd, temp_file = self._temp_file_for(jsonl_file)
+            try:
+                with open(fd, 'wb') as file:
+                    for question in questions_data:
+                        line = (json.dumps(question, ensure_ascii=False) + '\n').encode('utf-8')
+                        file.write(line)
+                        size += len(line)
+                os.replace(temp_file, jsonl_file)
+            except Exception:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+                raise
+            
+            self._write_jsonl_index(jsonl_file, {
+                "count": len(questions_data),
+                "size": size,
+                "next_id": max((q['id'] for q in questions_data), default=0) + 1,
+                "appended_since_compaction": 0
+            })
+            
+            print(f"✅ Quiz saved successfully: {jsonl_file}")
+            return jsonl_file
+        except Exception as e:
+            raise Exception(f"❌ Failed to save JSONL file: {e}")
+    
+    def read_jsonl_index(self, jsonl_file):
+        """Load the index for a JSONL quiz set, recovering it from the file if stale.
+        
+        The index records how many questions the file holds and how many bytes
+        of it are complete. If the file has grown past that (e.g. a crash between
+        appending and updating the index) only the new tail is scanned, provided
+        the indexed size still ends on a line boundary; otherwise (e.g. a hand
+        edit) the whole file is rescanned. A torn final line is left outside the
+        indexed size and is dropped on next append. A complete line that doesn't
+        parse is recorded as "bad_line_at" so appends and compaction refuse to
+        run rather than cut the file there. A recovered index is only returned;
+        the next append persists it under the set's lock.
+        """
+        jsonl_file = Path(jsonl_file)
+        index_file = jsonl_file.with_name(jsonl_file.name + '.idx')
+        index = {"count": 0, "size": 0, "next_id": 1, "appended_since_compaction": 0}
+        
+        try:
+            with open(index_file, 'r', encoding='utf-8') as file:
+                index.update(json.load(file))
+        except (FileNotFoundError, ValueError):
+            pass
+        
+        actual_size = jsonl_file.stat().st_size
+        if actual_size != index['size']:
+            with open(jsonl_file, 'rb') as file:
+                if index['size'] > 0 and actual_size > index['size']:
+                    file.seek(index['size'] - 1)
+                    on_boundary = file.read(1) == b'\n'
+                else:
+                    on_boundary = False
+                if not on_boundary:
+                    # File was replaced, truncated or edited behind our back - rebuild from scratch
+                    index = {"count": 0, "size": 0, "next_id": 1, "appended_since_compaction": 0}
+                file.seek(index['size'])
+                for raw_line in file:
+                    if not raw_line.endswith(b'\n'):
+                        break
+                    if raw_line.strip():
+                        try:
+                            question = json.loads(raw_line)
+                        except ValueError:
+                            index['bad_line_at'] = index['size']
+                            break
+                        index['count'] += 1
+                        index['next_id'] = max(index['next_id'], question.get('id', 0) + 1)
+                    index['size'] += len(raw_line)
+        
+        return index
+    
+    def iter_jsonl_lines(self, jsonl_file, index=None):
+        """Yield the non-blank question lines (as bytes) within the indexed size"""
+        if index is None:
+            index = self.read_jsonl_index(jsonl_file)
+        with open(jsonl_file, 'rb') as file:
+            remaining = index['size']
+            for raw_line in file:
+                if remaining <= 0:
+                    break
+                remaining -= len(raw_line)
+                line = raw_line.strip()
+                if line:
+                    yield line
+    
+    def _check_jsonl_lines(self, jsonl_file, index):
+        if 'bad_line_at' in index:
+            raise ValueError(f"❌ {jsonl_file.name} has an invalid line at byte {index['bad_line_at']}; "
+                             f"fix or remove it before appending or compacting")
+    
+    def _write_jsonl_index(self, jsonl_file, index):
+        index_file = jsonl_file.with_name(jsonl_file.name + '.idx')
+        fd, temp_file = self._temp_file_for(index_file)
+        with open(fd, 'w', encoding='utf-8') as file:
+            json.dump(index, file)
+        os.replace(temp_file, index_file)
+    
+    def remove_jsonl(self, output_name):
+        """Delete a set's .jsonl and index, e.g. after it was regenerated as plain JSON"""
+        with self.jsonl_lock(output_name):
+            for stale_file in self.jsonl_paths(output_name):
+                if stale_file.exists():
+                    os.remove(stale_file)
+    
+    def convert_to_jsonl(self, output_name):
+        """Make sure a quiz set is stored as JSONL, rebuilding it from quiz_<name>.json if needed.
+        
+        The .json is kept for static hosting. It is converted when there is no
+        .jsonl yet or when it is newer than the .jsonl (regenerated since).
+        Call with the set's lock held.
+        """
+        jsonl_file, _ = self.jsonl_paths(output_name)
+        json_file = self.data_dir / f"quiz_{output_name}.json"
+        if self.quiz_source_file(json_file) == jsonl_file:
+            return jsonl_file
+        
+        if not json_file.exists():
+            raise FileNotFoundError(f"❌ Quiz set not found: {json_file}")
+        
+        print(f"🔄 Converting {json_file.name} to JSON Lines storage...")
+        with open(json_file, 'r', encoding='utf-8') as file:
+            questions_data = json.load(file)
+        self.save_quiz_jsonl(questions_data, output_name)
+        return jsonl_file
+    
+    def append_questions(self, questions_data, output_name):
+        """Append questions to a JSONL quiz set without rewriting it.
+        
+        Questions are renumbered to follow the set's highest id. Only the new
+        lines and the small index file are written, so the cost depends on the
+        number of questions appended rather than the size of the set.
+        """
+        with self.jsonl_lock(output_name):
+            jsonl_file = self.convert_to_jsonl(output_name)
+            index = self.read_jsonl_index(jsonl_file)
+            self._check_jsonl_lines(jsonl_file, index)
+            
+            new_questions = [dict(question, id=index['next_id'] + i) for i, question in enumerate(questions_data)]
+            for i, question in enumerate(new_questions):
+                self.validate_question(question, index['count'] + i + 1)
+            data = b''.join((json.dumps(q, ensure_ascii=False) + '\n').encode('utf-8') for q in new_questions)
+            
+            appended = len(new_questions)
+            with open(jsonl_file, 'r+b') as file:
+                # Drop any torn line left past the indexed size by an interrupted append
+                file.seek(index['size'])
+                file.truncate()
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            
+            index['count'] += appended
+            index['size'] += len(data)
+            index['next_id'] += appended
+            index['appended_since_compaction'] += appended
+            self._write_jsonl_index(jsonl_file, index)
+        
+        print(f"✅ Appended {appended} questions to {jsonl_file.name} ({index['count']} total)")
+        return index
+    
+    def compact_jsonl(self, output_name):
+        """Rewrite a JSONL quiz set, refresh its .json snapshot and sync the config count.
+        
+        Blank and torn lines are dropped and duplicate ids (e.g. from lines
+        edited by hand) are given fresh ids so every question survives. The
+        set's lock is held until both files are replaced, so appends wait
+        instead of being lost. The .json is written first so the .jsonl stays
+        the newer, authoritative copy.
+        """
+        jsonl_file, _ = self.jsonl_paths(output_name)
+        if not jsonl_file.exists():
+            raise FileNotFoundError(f"❌ Not a JSONL quiz set: {jsonl_file}")
+        
+        with self.jsonl_lock(output_name):
+            # A .json regenerated since the last append replaces the log
+            self.convert_to_jsonl(output_name)
+            index = self.read_jsonl_index(jsonl_file)
+            self._check_jsonl_lines(jsonl_file, index)
+            
+            questions_data = []
+            seen_ids = set()
+            next_id = index['next_id']
+            for line in self.iter_jsonl_lines(jsonl_file, index):
+                question = json.loads(line)
+                if question.get('id') in seen_ids:
+                    question['id'] = next_id
+                    next_id += 1
+                seen_ids.add(question['id'])
+                questions_data.append(question)
+            
+            self.save_quiz_json(questions_data, output_name)
+            self.save_quiz_jsonl(questions_data, output_name)
+        
+        self.update_config_question_count(f"quiz_{output_name}.json", len(questions_data))
+        print(f"✅ Compacted {jsonl_file.name}: {len(questions_data)} questions")
+        return len(questions_data)
+    
     def update_config(self, quiz_filename, question_count, quiz_name=None, description=None):
         """Update quiz-config.json with new quiz"""
         print("🔧 Updating configuration...")
@@ -323,8 +715,26 @@ class QuizAutomation:
         except Exception as e:
             raise Exception(f"❌ Failed to update configuration: {e}")
     
-    def process_quiz(self, input_file, output_name, quiz_name=None, description=None):
-        """Main processing function"""
+    def update_config_question_count(self, quiz_key, question_count):
+        """Refresh question_count (and the count in the name) for an existing config entry"""
+        with open(self.config_file, 'r', encoding='utf-8') as file:
+            config = json.load(file)
+        
+        quiz_config = config['quiz-sets'].get(quiz_key)
+        if not quiz_config or quiz_config.get('question_count') == question_count:
+            return False
+        
+        quiz_config['question_count'] = question_count
+        quiz_config['name'] = re.sub(r'\(\d+ questions', f'({question_count} questions',
+                                     quiz_config.get('name', ''), count=1)
+        config['metadata']['last_updated'] = datetime.now().strftime("%Y-%m-%d")
+        
+        with open(self.config_file, 'w', encoding='utf-8') as file:
+            json.dump(config, file, indent=2, ensure_ascii=False)
+        return True
+    
+    def process_quiz(self, input_file, output_name, quiz_name=None, description=None, storage="json"):
+        """Main processing function (storage is "json" or "jsonl")"""
         print("[AUTOMATION] Starting quiz automation process...")
         print("=" * 50)
         
@@ -335,11 +745,20 @@ class QuizAutomation:
             # Step 2: Validate JSON structure
             self.validate_json(questions_data)
             
-            # Step 3: Save JSON file
-            output_file = self.save_quiz_json(questions_data, output_name)
+            # Step 3: Save JSON file (JSONL sets keep the .json name in the config;
+            # the server serves the .jsonl as a JSON array)
+            json_file = self.data_dir / f"quiz_{output_name}.json"
+            if storage == "jsonl":
+                # The .json is still written for static hosting; the newer .jsonl wins on the server
+                with self.jsonl_lock(output_name):
+                    self.save_quiz_json(questions_data, output_name)
+                    output_file = self.save_quiz_jsonl(questions_data, output_name)
+            else:
+                output_file = self.save_quiz_json(questions_data, output_name)
+                self.remove_jsonl(output_name)
             
             # Step 4: Update configuration
-            self.update_config(output_file, len(questions_data), quiz_name, description)
+            self.update_config(json_file, len(questions_data), quiz_name, description)
             
             print("=" * 50)
             print("🎉 Quiz automation completed successfully!")
@@ -355,10 +774,54 @@ class QuizAutomation:
             print(f"❌ Quiz automation failed: {e}")
             return False
 
+def append_main(args):
+    """python quiz_automation.py append <questions_file.txt> <output_name>"""
+    if len(args) < 2:
+        print("📝 Usage: python quiz_automation.py append [input_file] [output_name]")
+        return False
+    
+    input_file, output_name = args[0], args[1]
+    automation = QuizAutomation()
+    try:
+        questions_data = automation.parse_questions_txt(input_file)
+        if not questions_data:
+            raise ValueError("❌ No questions found in data")
+        index = automation.append_questions(questions_data, output_name)
+        print(f"💡 Config count refreshes on compaction: python quiz_automation.py compact {output_name}")
+        print(f"   (a running server compacts in the background; {index['appended_since_compaction']} appended since last compaction)")
+        return True
+    except Exception as e:
+        print(f"❌ Append failed: {e}")
+        return False
+
+def compact_main(args):
+    """python quiz_automation.py compact <output_name>"""
+    if len(args) < 1:
+        print("📝 Usage: python quiz_automation.py compact [output_name]")
+        return False
+    
+    try:
+        QuizAutomation().compact_jsonl(args[0])
+        return True
+    except Exception as e:
+        print(f"❌ Compaction failed: {e}")
+        return False
+
 def main():
     """Command line interface"""
     automation = QuizAutomation()
     
+    args = sys.argv[1:]
+    if args and args[0] == "append":
+        return append_main(args[1:])
+    if args and args[0] == "compact":
+        return compact_main(args[1:])
+    
+    storage = "json"
+    if "--jsonl" in args:
+        args.remove("--jsonl")
+        storage = "jsonl"
+    
     # Default values
     input_file = "questions.txt"
     output_name = "auto_generated"
@@ -366,24 +829,25 @@ def main():
     description = None
     
     # Parse command line arguments
-    if len(sys.argv) > 1:
-        input_file = sys.argv[1]
-    if len(sys.argv) > 2:
-        output_name = sys.argv[2]
-    if len(sys.argv) > 3:
-        quiz_name = sys.argv[3]
-    if len(sys.argv) > 4:
-        description = sys.argv[4]
+    if len(args) > 0:
+        input_file = args[0]
+    if len(args) > 1:
+        output_name = args[1]
+    if len(args) > 2:
+        quiz_name = args[2]
+    if len(args) > 3:
+        description = args[3]
     
     # Check if input file exists
     if not os.path.exists(input_file):
         print(f"❌ Input file not found: {input_file}")
-        print("📝 Usage: python quiz_automation.py [input_file] [output_name] [quiz_name] [description]")
+        print("📝 Usage: python quiz_automation.py [input_file] [output_name] [quiz_name] [description] [--jsonl]")
         print("📝 Example: python quiz_automation.py questions.txt aws_security \"AWS Security Quiz\" \"Security focused questions\"")
+        print("📝 Append:  python quiz_automation.py append more_questions.txt aws_security")
         return False
     
     # Process the quiz
-    success = automation.process_quiz(input_file, output_name, quiz_name, description)
+    success = automation.process_quiz(input_file, output_name, quiz_name, description, storage)
     
     if success:
         print("\n🌟 Ready to use! Start your server and check the updated quiz list.")